@@ -1,50 +1,248 @@
-from dotenv import load_dotenv, find_dotenv
+from dotenv import load_dotenv
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
+from itertools import chain, count
 import os
+import threading
+import time
 import mysql.connector
-from typing import List, Dict, Any, cast
-from mysql.connector.cursor import MySQLCursorDict  # opción C si la prefieres
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+from typing import List, Dict, Any, Iterator, cast
+
+# Carga .env solo si el entorno no trae ya la configuración
+if os.getenv("DB_HOST") is None:
+    load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def _db_config() -> Dict[str, Any]:
+    """
+    Configuración de conexión leída del entorno una sola vez.
+    """
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "user": os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", ""),
+        "database": os.getenv("DB_NAME", "residentes_db"),
+        "port": int(os.getenv("DB_PORT", "3306")),
+        "charset": "utf8mb4",
+        # Sin reset de sesión al devolver la conexión al pool, una lectura dejaría
+        # abierta su transacción (y su snapshot) para el siguiente request.
+        "autocommit": True,
+    }
+
+
+# mysql.connector no admite pools de más de CNX_POOL_MAXSIZE (32) conexiones
+DB_POOL_SIZE = min(int(os.getenv("DB_POOL_SIZE", "20")), pooling.CNX_POOL_MAXSIZE)
+
+# Sentencias SQL. Al ser siempre el mismo objeto str, el cursor preparado
+# que las ejecuta reconoce la sentencia y no la vuelve a preparar.
+SELECT_PAGE_SQL = """
+    SELECT id, nombre, apellido, fecha_nacimiento, pasaporte, 
+           email, telefono, direccion, ocupacion, estado_civil, version 
+    FROM residentes WHERE id > %s ORDER BY id LIMIT %s
+"""
+SELECT_SUMMARY_PAGE_SQL = """
+    SELECT id, nombre, apellido 
+    FROM residentes WHERE id > %s ORDER BY id LIMIT %s
+"""
+# id es PRIMARY KEY: búsqueda directa por el índice, a lo sumo una fila
+SELECT_BY_ID_SQL = """
+    SELECT id, nombre, apellido, fecha_nacimiento, pasaporte, 
+           email, telefono, direccion, ocupacion, estado_civil, version 
+    FROM residentes WHERE id = %s LIMIT 1
+"""
+EXISTS_SQL = "SELECT 1 FROM residentes WHERE id = %s LIMIT 1"
+# La inserción simple y la masiva comparten columnas: solo cambia cuántas filas van en VALUES
+INSERT_PREFIX_SQL = """
+    INSERT INTO residentes (nombre, apellido, fecha_nacimiento, pasaporte, 
+                           email, telefono, direccion, ocupacion, estado_civil)
+    VALUES """
+INSERT_ROW_SQL = "(%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+INSERT_SQL = INSERT_PREFIX_SQL + INSERT_ROW_SQL + "\n"
+UPDATE_SQL = """
+    UPDATE residentes 
+    SET nombre = %s, apellido = %s, fecha_nacimiento = %s, pasaporte = %s,
+        email = %s, telefono = %s, direccion = %s, ocupacion = %s, estado_civil = %s,
+        version = LAST_INSERT_ID(version + 1)
+    WHERE id = %s
+"""
+UPDATE_IF_VERSION_SQL = UPDATE_SQL.rstrip() + " AND version = %s\n"
+DELETE_SQL = "DELETE FROM residentes WHERE id = %s"
+
+# Columnas de SELECT_PAGE_SQL y SELECT_BY_ID_SQL, en orden: claves de los dicts de fila
+_COLUMNAS = (
+    "id", "nombre", "apellido", "fecha_nacimiento", "pasaporte",
+    "email", "telefono", "direccion", "ocupacion", "estado_civil", "version"
+)
+
+# Filas por sentencia en las inserciones masivas (mantiene el paquete bajo max_allowed_packet)
+BULK_CHUNK_SIZE = 500
+
+# Versión de los datos en este proceso: cambia con cada escritura
+_version_counter = count(1)
+_data_version = 0
+
+# Caché en memoria de residentes por id (LRU con expiración)
+ID_CACHE_SIZE = 1024
+ID_CACHE_TTL = 30.0
+_id_cache: "OrderedDict[int, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_id_cache_lock = threading.Lock()
+
+_pool: pooling.MySQLConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def init_pool() -> pooling.MySQLConnectionPool:
+    """
+    Devuelve el pool de conexiones, creándolo (y abriendo sus conexiones) si aún no existe.
+    Importar el módulo no requiere que el servidor esté disponible: el pool se
+    crea al arrancar la aplicación o, si eso falla, en el primer uso.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="residentes",
+                    pool_size=DB_POOL_SIZE,
+                    pool_reset_session=False,
+                    **_db_config()
+                )
+    return _pool
 
-# Carga .env desde la raíz
-load_dotenv(find_dotenv())
 
 def get_connection():
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        user=os.getenv("DB_USER", "root"),
-        password=os.getenv("DB_PASSWORD", ""),
-        database=os.getenv("DB_NAME", "residentes_db"),
-        port=int(os.getenv("DB_PORT", "3306")),
-        charset="utf8mb4"
-    )
+    """
+    Obtiene una conexión del pool; conn.close() la devuelve al pool.
+    Si el pool está agotado se abre una conexión directa para no fallar el request.
+    """
+    try:
+        return init_pool().get_connection()
+    except PoolError:
+        return mysql.connector.connect(**_db_config())
 
-def fetch_all_residentes() -> List[Dict[str, Any]]:
+
+@contextmanager
+def db_session(transaction: bool = False) -> Iterator[Any]:
     """
-    Ejecuta SELECT * FROM residentes y devuelve una lista de dicts.
+    Presta una conexión para una unidad de trabajo y la devuelve al pool al salir.
+    Con transaction=True las sentencias se confirman juntas al terminar el bloque
+    y se revierten si ocurre una excepción.
     """
-    conn = None
+    conn = get_connection()
     try:
-        conn = get_connection()
-        cur: MySQLCursorDict
-        cur = conn.cursor(dictionary=True)  # type: ignore[assignment]
-        try:
-            cur.execute(
-                """SELECT id, nombre, apellido, fecha_nacimiento, pasaporte, 
-                   email, telefono, direccion, ocupacion, estado_civil 
-                   FROM residentes;"""
-            )
-            rows = cast(List[Dict[str, Any]], cur.fetchall())
-            return rows
-        finally:
-            cur.close()
+        if transaction:
+            conn.start_transaction()
+        yield conn
+        if transaction:
+            conn.commit()
+    except Exception:
+        if transaction:
+            conn.rollback()
+        raise
     finally:
-        if conn:
-            conn.close()
+        conn.close()
+
+
+def _bump_data_version() -> None:
+    global _data_version
+    _data_version = next(_version_counter)
+
+
+def get_data_version() -> int:
+    """
+    Devuelve la versión actual de los datos de este proceso.
+    Cambia con cada inserción, actualización o eliminación hecha aquí.
+    """
+    return _data_version
+
+
+def _id_cache_get(residente_id: int) -> Dict[str, Any] | None:
+    with _id_cache_lock:
+        entry = _id_cache.get(residente_id)
+        if entry is None:
+            return None
+        expira, row = entry
+        if expira < time.monotonic():
+            del _id_cache[residente_id]
+            return None
+        _id_cache.move_to_end(residente_id)
+        return row
+
+
+def _id_cache_put(residente_id: int, row: Dict[str, Any], version: int) -> None:
+    with _id_cache_lock:
+        # Si hubo una escritura durante la lectura, la fila puede estar desactualizada
+        if version != _data_version:
+            return
+        _id_cache[residente_id] = (time.monotonic() + ID_CACHE_TTL, row)
+        _id_cache.move_to_end(residente_id)
+        if len(_id_cache) > ID_CACHE_SIZE:
+            _id_cache.popitem(last=False)
+
+
+def _id_cache_discard(residente_id: int) -> None:
+    with _id_cache_lock:
+        _id_cache.pop(residente_id, None)
+
+
+def _execute_prepared(conn, sql: str, params: tuple, dictionary: bool = False):
+    """
+    Ejecuta `sql` con un cursor preparado (protocolo binario) y lo devuelve.
+    Los cursores se guardan en la conexión física, así que sobreviven entre
+    préstamos del pool y el servidor solo analiza cada sentencia una vez.
+    """
+    cnx = getattr(conn, "_cnx", conn)  # PooledMySQLConnection envuelve la conexión real
+    # Si el pool reconectó, los statements preparados anteriores ya no existen
+    if getattr(cnx, "_prep_cache_id", None) != cnx.connection_id:
+        cnx._prep_cache = {}
+        cnx._prep_cache_id = cnx.connection_id
+
+    key = (sql, dictionary)
+    cur = cnx._prep_cache.get(key)
+    if cur is None:
+        cur = cnx.cursor(prepared=True, dictionary=dictionary)
+        cnx._prep_cache[key] = cur
+
+    cur.execute(sql, params)
+    return cur
+
+
+def fetch_all_residentes(limit: int = 50, after_id: int = 0) -> List[Dict[str, Any]]:
+    """
+    Devuelve una página de residentes como lista de dicts, ordenada por id.
+    Paginación por clave: trae hasta `limit` residentes con id mayor a `after_id`.
+    """
+    with db_session() as conn:
+        # Cursor de tuplas: el dict de cada fila se arma una sola vez con zip
+        cur = _execute_prepared(conn, SELECT_PAGE_SQL, (after_id, limit))
+        return [dict(zip(_COLUMNAS, row)) for row in cur.fetchall()]
+
+
+def fetch_residentes_summary(limit: int = 50, after_id: int = 0) -> List[Dict[str, Any]]:
+    """
+    Igual que fetch_all_residentes, pero solo con id, nombre y apellido.
+    Para listados que no necesitan el resto de las columnas.
+    """
+    with db_session() as conn:
+        cur = _execute_prepared(
+            conn,
+            SELECT_SUMMARY_PAGE_SQL,
+            (after_id, limit),
+            dictionary=True
+        )
+        rows = cast(List[Dict[str, Any]], cur.fetchall())
+        return rows
 
 
 def insert_residente(
     nombre: str, 
     apellido: str,
-    fecha_nacimiento: str,
+    fecha_nacimiento: date,
     pasaporte: str,
     email: str,
     telefono: str | None = None, 
@@ -56,27 +254,43 @@ def insert_residente(
     Inserta un nuevo residente en la base de datos.
     Retorna el ID del residente insertado.
     """
-    conn = None
-    try:
-        conn = get_connection()
+    with db_session() as conn:
+        cur = _execute_prepared(
+            conn,
+            INSERT_SQL,
+            (nombre, apellido, fecha_nacimiento, pasaporte, email, telefono, 
+             direccion, ocupacion, estado_civil)
+        )
+        _bump_data_version()
+        return cur.lastrowid or 0
+
+
+def insert_residentes_bulk(rows: List[tuple]) -> int:
+    """
+    Inserta varios residentes usando sentencias INSERT de múltiples filas,
+    en bloques de BULK_CHUNK_SIZE y dentro de una sola transacción.
+    Cada tupla sigue el orden de columnas de insert_residente.
+    Retorna la cantidad de residentes insertados.
+    """
+    if not rows:
+        return 0
+
+    with db_session(transaction=True) as conn:
         cur = conn.cursor()
         try:
-            cur.execute(
-                """
-                INSERT INTO residentes (nombre, apellido, fecha_nacimiento, pasaporte, 
-                                       email, telefono, direccion, ocupacion, estado_civil)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (nombre, apellido, fecha_nacimiento, pasaporte, email, telefono, 
-                 direccion, ocupacion, estado_civil)
-            )
-            conn.commit()
-            return cur.lastrowid or 0
+            insertados = 0
+            for inicio in range(0, len(rows), BULK_CHUNK_SIZE):
+                chunk = rows[inicio:inicio + BULK_CHUNK_SIZE]
+                cur.execute(
+                    INSERT_PREFIX_SQL + ", ".join([INSERT_ROW_SQL] * len(chunk)),
+                    list(chain.from_iterable(chunk))
+                )
+                insertados += cur.rowcount
         finally:
             cur.close()
-    finally:
-        if conn:
-            conn.close()
+
+    _bump_data_version()
+    return insertados
 
 
 def delete_residente(residente_id: int) -> bool:
@@ -84,85 +298,78 @@ def delete_residente(residente_id: int) -> bool:
     Elimina un residente de la base de datos por su ID.
     Retorna True si se eliminó correctamente, False si no se encontró.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur = conn.cursor()
-        try:
-            cur.execute(
-                "DELETE FROM residentes WHERE id = %s",
-                (residente_id,)
-            )
-            conn.commit()
-            return cur.rowcount > 0
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
+    with db_session() as conn:
+        cur = _execute_prepared(
+            conn,
+            DELETE_SQL,
+            (residente_id,)
+        )
+        if cur.rowcount > 0:
+            _bump_data_version()
+            _id_cache_discard(residente_id)
+            return True
+        return False
 
 
 def fetch_residente_by_id(residente_id: int) -> Dict[str, Any] | None:
     """
-    Obtiene un residente por su ID.
+    Obtiene un residente por su ID, usando la caché en memoria si está vigente.
     Retorna un dict con los datos del residente o None si no existe.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur: MySQLCursorDict
-        cur = conn.cursor(dictionary=True)  # type: ignore[assignment]
-        try:
-            cur.execute(
-                """SELECT id, nombre, apellido, fecha_nacimiento, pasaporte, 
-                   email, telefono, direccion, ocupacion, estado_civil 
-                   FROM residentes WHERE id = %s""",
-                (residente_id,)
-            )
-            result = cur.fetchone()
-            return dict(result) if result else None
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
+    cached = _id_cache_get(residente_id)
+    if cached is not None:
+        return dict(cached)
+
+    version = _data_version
+    with db_session() as conn:
+        cur = _execute_prepared(conn, SELECT_BY_ID_SQL, (residente_id,))
+        # fetchall consume el resultado completo: el cursor queda listo para reutilizarse
+        result = cur.fetchall()
+        if not result:
+            return None
+        row = dict(zip(_COLUMNAS, result[0]))
+        _id_cache_put(residente_id, row, version)
+        return dict(row)
+
+
+def residente_existe(residente_id: int) -> bool:
+    """
+    Indica si el residente existe, consultando siempre la BD (sin pasar por la caché).
+    """
+    with db_session() as conn:
+        cur = _execute_prepared(conn, EXISTS_SQL, (residente_id,))
+        return bool(cur.fetchall())
 
 
 def update_residente(
     residente_id: int,
     nombre: str,
     apellido: str,
-    fecha_nacimiento: str,
+    fecha_nacimiento: date,
     pasaporte: str,
     email: str,
     telefono: str | None = None,
     direccion: str | None = None,
     ocupacion: str | None = None,
-    estado_civil: str | None = None
-) -> bool:
+    estado_civil: str | None = None,
+    version: int | None = None
+) -> int | None:
     """
-    Actualiza los datos de un residente existente.
-    Retorna True si se actualizó correctamente, False si no se encontró.
+    Actualiza los datos de un residente existente e incrementa su versión.
+    Si se indica `version`, solo actualiza si la fila sigue en esa versión
+    (control de concurrencia optimista).
+    Retorna la nueva versión, o None si no se encontró o la versión no coincide.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur = conn.cursor()
-        try:
-            cur.execute(
-                """
-                UPDATE residentes 
-                SET nombre = %s, apellido = %s, fecha_nacimiento = %s, pasaporte = %s,
-                    email = %s, telefono = %s, direccion = %s, ocupacion = %s, estado_civil = %s
-                WHERE id = %s
-                """,
-                (nombre, apellido, fecha_nacimiento, pasaporte, email, telefono, 
-                 direccion, ocupacion, estado_civil, residente_id)
-            )
-            conn.commit()
-            return cur.rowcount > 0
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
+    params = (nombre, apellido, fecha_nacimiento, pasaporte, email, telefono,
+              direccion, ocupacion, estado_civil, residente_id)
+    with db_session() as conn:
+        # LAST_INSERT_ID(expr) deja la nueva versión en cur.lastrowid sin otra consulta
+        if version is None:
+            cur = _execute_prepared(conn, UPDATE_SQL, params)
+        else:
+            cur = _execute_prepared(conn, UPDATE_IF_VERSION_SQL, params + (version,))
+        if cur.rowcount > 0:
+            _bump_data_version()
+            _id_cache_discard(residente_id)
+            return cur.lastrowid
+        return None
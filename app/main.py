@@ -1,18 +1,30 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import date
+from functools import partial
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import mysql.connector
-import re
+import secrets
 
+from app import validation
 from app.database import (
     fetch_all_residentes,
+    fetch_residentes_summary,
     insert_residente,
+    insert_residentes_bulk,
     delete_residente,
     fetch_residente_by_id,
-    update_residente
+    residente_existe,
+    update_residente,
+    get_data_version,
+    init_pool,
+    DB_POOL_SIZE
 )
 
 
@@ -21,129 +33,20 @@ class ResidenteBase(BaseModel):
     apellido: str
     fecha_nacimiento: date
     pasaporte: str
-    email: EmailStr
+    email: str
     telefono: Optional[str] = None
     direccion: Optional[str] = None
     ocupacion: Optional[str] = None
     estado_civil: Optional[str] = None
 
-    @field_validator('nombre', 'apellido')
-    @classmethod
-    def validar_nombre_apellido(cls, value: str) -> str:
-        if not value or not value.strip():
-            raise ValueError('El campo no puede estar vacío')
-
-        value = value.strip()
-
-        if len(value) < 2:
-            raise ValueError('Debe tener al menos 2 caracteres')
-
-        if len(value) > 100:
-            raise ValueError('No puede exceder 100 caracteres')
-
-        if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ\s]+$', value):
-            raise ValueError('Solo se permiten letras y espacios')
-
-        return value.title()
-
-    @field_validator('fecha_nacimiento')
-    @classmethod
-    def validar_fecha_nacimiento(cls, value: date) -> date:
-        if value > date.today():
-            raise ValueError('La fecha de nacimiento no puede ser futura')
-
-        edad_aprox = (date.today() - value).days // 365
-        if edad_aprox > 150:
-            raise ValueError('La fecha de nacimiento no es válida')
-
-        return value
-
-    @field_validator('pasaporte')
-    @classmethod
-    def validar_pasaporte(cls, value: str) -> str:
-        if not value or not value.strip():
-            raise ValueError('El pasaporte es obligatorio')
-
-        value = value.strip().upper()
-
-        if len(value) < 6:
-            raise ValueError('El pasaporte debe tener al menos 6 caracteres')
-
-        if len(value) > 50:
-            raise ValueError('El pasaporte no puede exceder 50 caracteres')
-
-        if not re.match(r'^[A-Z0-9\-]+$', value):
-            raise ValueError('El pasaporte solo puede contener letras, números y guiones')
-
-        return value
-
-    @field_validator('telefono')
-    @classmethod
-    def validar_telefono(cls, value: Optional[str]) -> Optional[str]:
-        if value is None or value.strip() == '':
-            return None
-
-        value = value.strip()
-        telefono_limpio = re.sub(r'[\s\-\(\)]', '', value)
-
-        if not re.match(r'^\+?\d{7,15}$', telefono_limpio):
-            raise ValueError('Formato de teléfono inválido. Debe contener entre 7 y 15 dígitos')
-
-        return value
-
-    @field_validator('direccion')
-    @classmethod
-    def validar_direccion(cls, value: Optional[str]) -> Optional[str]:
-        if value is None or value.strip() == '':
-            return None
-
-        value = value.strip()
-
-        if len(value) > 255:
-            raise ValueError('La dirección no puede exceder 255 caracteres')
-
-        return value
-
-    @field_validator('ocupacion')
-    @classmethod
-    def validar_ocupacion(cls, value: Optional[str]) -> Optional[str]:
-        if value is None or value.strip() == '':
-            return None
-
-        value = value.strip()
-
-        if len(value) > 100:
-            raise ValueError('La ocupación no puede exceder 100 caracteres')
-
-        if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ\s\.\-]+$', value):
-            raise ValueError('La ocupación solo puede contener letras, espacios, puntos y guiones')
-
-        return value.title()
-
-    @field_validator('estado_civil')
-    @classmethod
-    def validar_estado_civil(cls, value: Optional[str]) -> Optional[str]:
-        if value is None or value.strip() == '':
-            return None
-
-        value = value.strip().title()
-
-        estados_validos = [
-            'Soltero',
-            'Soltera',
-            'Casado',
-            'Casada',
-            'Divorciado',
-            'Divorciada',
-            'Viudo',
-            'Viuda',
-            'Unión Libre'
-        ]
-
-        if value not in estados_validos:
-            raise ValueError(f'Estado civil inválido. Opciones válidas: {", ".join(estados_validos)}')
-
-        return value
+    validar_nombre_apellido = field_validator('nombre', 'apellido')(validation.validar_nombre_apellido)
+    validar_fecha_nacimiento = field_validator('fecha_nacimiento')(validation.validar_fecha_nacimiento)
+    validar_pasaporte = field_validator('pasaporte')(validation.validar_pasaporte)
+    validar_email = field_validator('email')(validation.validar_email)
+    validar_telefono = field_validator('telefono')(validation.validar_telefono)
+    validar_direccion = field_validator('direccion')(validation.validar_direccion)
+    validar_ocupacion = field_validator('ocupacion')(validation.validar_ocupacion)
+    validar_estado_civil = field_validator('estado_civil')(validation.validar_estado_civil)
 
 
 class ResidenteCreate(ResidenteBase):
@@ -151,7 +54,8 @@ class ResidenteCreate(ResidenteBase):
 
 
 class ResidenteUpdate(ResidenteBase):
-    pass
+    # Versión leída por el cliente; si se envía, la actualización falla con 409 si cambió
+    version: Optional[int] = None
 
 
 class ResidenteOut(ResidenteBase):
@@ -170,13 +74,44 @@ class ResidenteOutDB(BaseModel):
     direccion: Optional[str] = None
     ocupacion: Optional[str] = None
     estado_civil: Optional[str] = None
+    version: int = 0
+
+
+class ResidenteResumen(BaseModel):
+    id: int
+    nombre: str
+    apellido: str
 
 
 class DeleteResponse(BaseModel):
     mensaje: str
 
 
-app = FastAPI(title="Sistema de Gestion de Residentes - Embajada")
+class BulkInsertResponse(BaseModel):
+    mensaje: str
+    insertados: int
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # asyncio.to_thread usa el executor por defecto: con tantos hilos como conexiones
+    # en el pool, las consultas esperan turno en vez de abrir conexiones extra
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+    )
+    # Abrir las conexiones del pool al arrancar, no en el primer request
+    try:
+        await asyncio.to_thread(init_pool)
+    except mysql.connector.Error as exc:
+        print(f"Database pool not ready at startup, retrying on first request: {exc}")
+    yield
+
+
+app = FastAPI(
+    title="Sistema de Gestion de Residentes - Embajada",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # Configurar CORS para permitir requests desde el frontend
 app.add_middleware(
@@ -187,47 +122,162 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprimir respuestas grandes (los listados de residentes)
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 
 @app.exception_handler(mysql.connector.Error)
 async def database_exception_handler(request, exc: mysql.connector.Error):
     import traceback
     print(f"Database error: {exc}")
     print(traceback.format_exc())
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": f"Error de base de datos: {str(exc)}"}
     )
 
 
-def map_rows_to_residentes(rows: List[dict]) -> List[ResidenteOutDB]:
-    return [ResidenteOutDB(**row) for row in rows]
+# Tamaño máximo de página en los listados: acota memoria y latencia por request
+MAX_PAGE_SIZE = 200
+
+# Residentes por request en la inserción masiva: acota la transacción y el hilo de BD que ocupa
+MAX_BULK_SIZE = 1000
+
+# El prefijo cambia en cada arranque: un ETag emitido antes de reiniciar no vuelve a coincidir.
+# La versión es local al proceso, por lo que asume un único worker.
+_ETAG_PREFIX = secrets.token_hex(4)
+_CACHE_CONTROL = "private, max-age=5"
+
+
+def _etag(version: int) -> str:
+    return f'W/"{_ETAG_PREFIX}-{version}"'
+
+
+def _etag_actual() -> str:
+    return _etag(get_data_version())
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+def _set_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+
+
+# Lecturas por id en curso: las peticiones concurrentes por el mismo id comparten una consulta.
+# La clave incluye la versión de los datos: tras una escritura, una lectura nueva no se une
+# a una consulta iniciada antes (y no recibe la fila vieja con el ETag nuevo).
+_inflight: Dict[Tuple[int, int], "asyncio.Task[Optional[Dict[str, Any]]]"] = {}
+
+
+def _release_inflight(key: Tuple[int, int], task: "asyncio.Task[Any]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+
+async def fetch_residente_coalesced(residente_id: int, version: int) -> Optional[Dict[str, Any]]:
+    key = (residente_id, version)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(asyncio.to_thread(fetch_residente_by_id, residente_id))
+        _inflight[key] = task
+        task.add_done_callback(partial(_release_inflight, key))
+    # shield: si un cliente se desconecta, la consulta sigue para los demás
+    return await asyncio.shield(task)
+
+
+def _not_modified_response(etag: str) -> Response:
+    response = Response(status_code=304)
+    _set_cache_headers(response, etag)
+    return response
+
+
+def _head_response(request: Request, etag: str) -> Response:
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+    response = Response(status_code=200)
+    # Un HEAD no puede anunciar un Content-Length distinto al que tendría el GET
+    del response.headers["content-length"]
+    _set_cache_headers(response, etag)
+    return response
+
+
+def _read_response(content: Any, etag: str) -> ORJSONResponse:
+    # Las filas de la BD ya tienen los tipos correctos. Al devolver la respuesta
+    # directamente, FastAPI no las vuelve a validar contra response_model
+    # (que se mantiene solo para la documentación OpenAPI).
+    response = ORJSONResponse(content)
+    _set_cache_headers(response, etag)
+    return response
 
 
 @app.get("/", response_model=dict)
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
 
 @app.get("/residentes", response_model=List[ResidenteOutDB])
-def list_residentes():
-    rows = fetch_all_residentes()
-    return map_rows_to_residentes(rows)
+async def list_residentes(
+    request: Request,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    after_id: int = Query(0, ge=0)
+):
+    # La versión se toma antes de leer para no etiquetar datos viejos con una versión nueva
+    etag = _etag_actual()
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    rows = await asyncio.to_thread(fetch_all_residentes, limit, after_id)
+    return _read_response(rows, etag)
+
+
+@app.get("/residentes/resumen", response_model=List[ResidenteResumen])
+async def list_residentes_resumen(
+    request: Request,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    after_id: int = Query(0, ge=0)
+):
+    etag = _etag_actual()
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    rows = await asyncio.to_thread(fetch_residentes_summary, limit, after_id)
+    return _read_response(rows, etag)
+
+
+# HEAD responde solo con el ETag, sin consultar la BD: sirve para validar la caché del cliente
+@app.head("/residentes", include_in_schema=False)
+@app.head("/residentes/resumen", include_in_schema=False)
+async def head_residentes(request: Request):
+    return _head_response(request, _etag_actual())
 
 
 @app.get("/residentes/{residente_id}", response_model=ResidenteOutDB)
-def get_residente(residente_id: int):
-    residente = fetch_residente_by_id(residente_id)
+async def get_residente(residente_id: int, request: Request):
+    # La misma versión etiqueta la respuesta y decide a qué consulta en curso unirse
+    version = get_data_version()
+    etag = _etag(version)
+    if _not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    residente = await fetch_residente_coalesced(residente_id, version)
     if not residente:
         raise HTTPException(status_code=404, detail="Residente no encontrado")
-    return ResidenteOutDB(**residente)
+    return _read_response(residente, etag)
 
 
 @app.post("/residentes", response_model=ResidenteOutDB, status_code=201)
-def create_residente(residente: ResidenteCreate):
-    residente_id = insert_residente(
+async def create_residente(residente: ResidenteCreate):
+    residente_id = await asyncio.to_thread(
+        insert_residente,
         residente.nombre,
         residente.apellido,
-        str(residente.fecha_nacimiento),
+        residente.fecha_nacimiento,
         residente.pasaporte,
         residente.email,
         residente.telefono,
@@ -236,43 +286,73 @@ def create_residente(residente: ResidenteCreate):
         residente.estado_civil
     )
 
-    created = fetch_residente_by_id(residente_id)
-    if created:
-        return ResidenteOutDB(**created)
-
-    payload = residente.model_dump()
-    return ResidenteOutDB(id=residente_id, **payload)
+    # El payload ya validado contiene todas las columnas: no hace falta releer la fila
+    return ResidenteOutDB(id=residente_id, **residente.model_dump())
+
+
+@app.post("/residentes/bulk", response_model=BulkInsertResponse, status_code=201)
+async def create_residentes_bulk(
+    residentes: List[ResidenteCreate] = Body(..., min_length=1, max_length=MAX_BULK_SIZE)
+):
+    filas = [
+        (
+            residente.nombre,
+            residente.apellido,
+            residente.fecha_nacimiento,
+            residente.pasaporte,
+            residente.email,
+            residente.telefono,
+            residente.direccion,
+            residente.ocupacion,
+            residente.estado_civil
+        )
+        for residente in residentes
+    ]
+    insertados = await asyncio.to_thread(insert_residentes_bulk, filas)
+
+    return BulkInsertResponse(
+        mensaje=f"{insertados} residentes insertados exitosamente",
+        insertados=insertados
+    )
 
 
 @app.put("/residentes/{residente_id}", response_model=ResidenteOutDB)
-def update_residente_endpoint(residente_id: int, residente: ResidenteUpdate):
-    actualizado = update_residente(
+async def update_residente_endpoint(residente_id: int, residente: ResidenteUpdate):
+    nueva_version = await asyncio.to_thread(
+        update_residente,
         residente_id,
         residente.nombre,
         residente.apellido,
-        str(residente.fecha_nacimiento),
+        residente.fecha_nacimiento,
         residente.pasaporte,
         residente.email,
         residente.telefono,
         residente.direccion,
         residente.ocupacion,
-        residente.estado_civil
+        residente.estado_civil,
+        residente.version
     )
 
-    if not actualizado:
+    if nueva_version is None:
+        # La caché por id podría seguir mostrando una fila ya eliminada por otro proceso
+        if residente.version is not None and await asyncio.to_thread(residente_existe, residente_id):
+            raise HTTPException(
+                status_code=409,
+                detail="El residente fue modificado por otro usuario. Recargue los datos e intente de nuevo"
+            )
         raise HTTPException(status_code=404, detail="Residente no encontrado")
 
-    updated = fetch_residente_by_id(residente_id)
-    if updated:
-        return ResidenteOutDB(**updated)
-
-    payload = residente.model_dump()
-    return ResidenteOutDB(id=residente_id, **payload)
+    # El payload ya validado contiene todas las columnas: no hace falta releer la fila
+    return ResidenteOutDB(
+        id=residente_id,
+        **residente.model_dump(exclude={"version"}),
+        version=nueva_version
+    )
 
 
 @app.delete("/residentes/{residente_id}", response_model=DeleteResponse)
-def delete_residente_endpoint(residente_id: int):
-    eliminado = delete_residente(residente_id)
+async def delete_residente_endpoint(residente_id: int):
+    eliminado = await asyncio.to_thread(delete_residente, residente_id)
 
     if not eliminado:
         raise HTTPException(status_code=404, detail="Residente no encontrado")
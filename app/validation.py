@@ -0,0 +1,155 @@
+from datetime import date
+from typing import Optional
+import re
+import string
+
+
+# Patrones de validación compilados una sola vez
+_RE_PASSPORT = re.compile(r'^[A-Z0-9\-]+$')
+_RE_PHONE = re.compile(r'^\+?\d{7,15}$')
+_RE_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Caracteres permitidos en nombres y ocupaciones; los espacios cubren lo mismo que \s.
+# U+3000 (espacio ideográfico) es el último carácter con str.isspace() verdadero, así que
+# basta recorrer hasta 0x3000 en vez de todo Unicode (tests/test_validation.py lo comprueba).
+_ESPACIOS = frozenset(c for c in map(chr, range(0x3001)) if c.isspace())
+_NAME_CHARS = frozenset(string.ascii_letters + 'áéíóúÁÉÍÓÚñÑüÜ') | _ESPACIOS
+_OCCUPATION_CHARS = _NAME_CHARS | frozenset('.-')
+
+# Separadores que se quitan del teléfono antes de validarlo (mismos que [\s\-\(\)])
+_PHONE_STRIP_TABLE = str.maketrans(dict.fromkeys(_ESPACIOS | frozenset('-()')))
+
+# Estados civiles aceptados (la tupla conserva el orden para el mensaje de error)
+_ESTADOS = (
+    'Soltero',
+    'Soltera',
+    'Casado',
+    'Casada',
+    'Divorciado',
+    'Divorciada',
+    'Viudo',
+    'Viuda',
+    'Unión Libre'
+)
+_ESTADOS_SET = frozenset(_ESTADOS)
+_ESTADOS_MSG = f'Estado civil inválido. Opciones válidas: {", ".join(_ESTADOS)}'
+
+
+def validar_nombre_apellido(value: str) -> str:
+    value = value.strip()
+    if not value:
+        raise ValueError('El campo no puede estar vacío')
+
+    if len(value) < 2:
+        raise ValueError('Debe tener al menos 2 caracteres')
+
+    if len(value) > 100:
+        raise ValueError('No puede exceder 100 caracteres')
+
+    if not _NAME_CHARS.issuperset(value):
+        raise ValueError('Solo se permiten letras y espacios')
+
+    return value.title()
+
+
+def validar_fecha_nacimiento(value: date) -> date:
+    hoy = date.today()
+    if value > hoy:
+        raise ValueError('La fecha de nacimiento no puede ser futura')
+
+    edad_aprox = (hoy - value).days // 365
+    if edad_aprox > 150:
+        raise ValueError('La fecha de nacimiento no es válida')
+
+    return value
+
+
+def validar_pasaporte(value: str) -> str:
+    value = value.strip().upper()
+    if not value:
+        raise ValueError('El pasaporte es obligatorio')
+
+    if len(value) < 6:
+        raise ValueError('El pasaporte debe tener al menos 6 caracteres')
+
+    if len(value) > 50:
+        raise ValueError('El pasaporte no puede exceder 50 caracteres')
+
+    if not _RE_PASSPORT.match(value):
+        raise ValueError('El pasaporte solo puede contener letras, números y guiones')
+
+    return value
+
+
+def validar_email(value: str) -> str:
+    value = value.strip()
+    if not value:
+        raise ValueError('El email es obligatorio')
+
+    if len(value) > 150:
+        raise ValueError('El email no puede exceder 150 caracteres')
+
+    if not _RE_EMAIL.match(value):
+        raise ValueError('Formato de email inválido')
+
+    return value
+
+
+def validar_telefono(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+
+    value = value.strip()
+    if not value:
+        return None
+    telefono_limpio = value.translate(_PHONE_STRIP_TABLE)
+
+    if not _RE_PHONE.match(telefono_limpio):
+        raise ValueError('Formato de teléfono inválido. Debe contener entre 7 y 15 dígitos')
+
+    return value
+
+
+def validar_direccion(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+
+    value = value.strip()
+    if not value:
+        return None
+
+    if len(value) > 255:
+        raise ValueError('La dirección no puede exceder 255 caracteres')
+
+    return value
+
+
+def validar_ocupacion(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+
+    value = value.strip()
+    if not value:
+        return None
+
+    if len(value) > 100:
+        raise ValueError('La ocupación no puede exceder 100 caracteres')
+
+    if not _OCCUPATION_CHARS.issuperset(value):
+        raise ValueError('La ocupación solo puede contener letras, espacios, puntos y guiones')
+
+    return value.title()
+
+
+def validar_estado_civil(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+
+    value = value.strip().title()
+    if not value:
+        return None
+
+    if value not in _ESTADOS_SET:
+        raise ValueError(_ESTADOS_MSG)
+
+    return value
@@ -0,0 +1,11 @@
+-- =========================================================
+-- MIGRACIÓN: columna 'version' para control de concurrencia optimista
+-- Descripción:
+--   Agrega a una base existente la columna que incrementa cada UPDATE.
+--   Las bases creadas con docs/init_db.sql ya la incluyen.
+-- =========================================================
+
+USE residentes_db;
+
+ALTER TABLE residentes
+    ADD COLUMN version INT NOT NULL DEFAULT 0;
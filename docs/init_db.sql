@@ -27,7 +27,8 @@ CREATE TABLE residentes (
     telefono VARCHAR(50),
     direccion VARCHAR(255),
     ocupacion VARCHAR(100),
-    estado_civil VARCHAR(20)
+    estado_civil VARCHAR(20),
+    version INT NOT NULL DEFAULT 0
 );
 
 -- 5️⃣ Insertar algunos registros de ejemplo
@@ -0,0 +1,22 @@
+"""
+Punto de entrada del servidor: python run.py
+
+Usa uvloop como event loop (no disponible en Windows) y httptools como parser HTTP.
+Configurable con APP_HOST, APP_PORT y WEB_CONCURRENCY (número de workers).
+"""
+import os
+import sys
+
+import uvicorn
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("APP_HOST", "127.0.0.1"),
+        port=int(os.getenv("APP_PORT", "8000")),
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        # Un worker por defecto: los ETag y la caché por id son locales a cada proceso
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
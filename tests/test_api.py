@@ -0,0 +1,229 @@
+"""
+Tests de los endpoints de residentes sin base de datos.
+Las funciones de app.database que usa app.main se reemplazan por stubs.
+"""
+import asyncio
+import sys
+import threading
+from datetime import date
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# Agregar el directorio raíz al path para importar app
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app import database, main
+
+
+FILA = {
+    "id": 1,
+    "nombre": "Juan",
+    "apellido": "Pérez",
+    "fecha_nacimiento": date(1985, 3, 15),
+    "pasaporte": "A1234567",
+    "email": "juan@example.com",
+    "telefono": None,
+    "direccion": None,
+    "ocupacion": None,
+    "estado_civil": "Soltero",
+    "version": 0,
+}
+
+PAYLOAD = {
+    "nombre": "Ana",
+    "apellido": "López",
+    "fecha_nacimiento": "1990-01-01",
+    "pasaporte": "B7654321",
+    "email": "ana@example.com",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "_inflight", {})
+    monkeypatch.setattr(main, "fetch_all_residentes", lambda limit, after_id: [dict(FILA)])
+    monkeypatch.setattr(main, "fetch_residente_by_id", lambda i: dict(FILA) if i == 1 else None)
+    return TestClient(main.app)
+
+
+def test_listado_304_y_etag_nuevo_tras_escritura(client, monkeypatch):
+    def insert_stub(*args):
+        database._bump_data_version()
+        return 7
+
+    monkeypatch.setattr(main, "insert_residente", insert_stub)
+
+    primera = client.get("/residentes")
+    assert primera.status_code == 200
+    etag = primera.headers["etag"]
+
+    repetida = client.get("/residentes", headers={"If-None-Match": etag})
+    assert repetida.status_code == 304
+    assert repetida.headers["etag"] == etag
+
+    assert client.post("/residentes", json=PAYLOAD).status_code == 201
+
+    tras_escritura = client.get("/residentes", headers={"If-None-Match": etag})
+    assert tras_escritura.status_code == 200
+    assert tras_escritura.headers["etag"] != etag
+
+
+def test_get_por_id_304(client):
+    primera = client.get("/residentes/1")
+    assert primera.status_code == 200
+    assert primera.json()["nombre"] == "Juan"
+
+    etag = primera.headers["etag"]
+    assert client.get("/residentes/1", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_head_listado_no_consulta_la_bd(client, monkeypatch):
+    def no_llamar(*args):
+        raise AssertionError("HEAD no debe consultar la base de datos")
+
+    monkeypatch.setattr(main, "fetch_all_residentes", no_llamar)
+
+    respuesta = client.head("/residentes")
+    assert respuesta.status_code == 200
+    assert "content-length" not in respuesta.headers
+
+    etag = respuesta.headers["etag"]
+    assert client.head("/residentes", headers={"If-None-Match": etag}).status_code == 304
+
+
+@pytest.mark.parametrize(
+    "existe, version, esperado",
+    [
+        (True, 3, 409),
+        (False, 3, 404),
+        (True, None, 404),
+    ],
+)
+def test_update_conflicto_o_no_encontrado(client, monkeypatch, existe, version, esperado):
+    monkeypatch.setattr(main, "update_residente", lambda *args: None)
+    monkeypatch.setattr(main, "residente_existe", lambda i: existe)
+
+    respuesta = client.put("/residentes/1", json=dict(PAYLOAD, version=version))
+    assert respuesta.status_code == esperado
+
+
+def _async_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test")
+
+
+def test_gets_concurrentes_comparten_una_consulta(monkeypatch):
+    monkeypatch.setattr(main, "_inflight", {})
+    llamadas = []
+    liberar = threading.Event()
+
+    def fetch_stub(residente_id):
+        llamadas.append(residente_id)
+        liberar.wait(timeout=5)
+        return dict(FILA)
+
+    monkeypatch.setattr(main, "fetch_residente_by_id", fetch_stub)
+
+    async def escenario():
+        async with _async_client() as ac:
+            async def soltar():
+                # Dar tiempo a que ambos requests se unan a la consulta en curso
+                await asyncio.sleep(0.2)
+                liberar.set()
+
+            respuestas = await asyncio.gather(
+                ac.get("/residentes/1"),
+                ac.get("/residentes/1"),
+                soltar(),
+            )
+        return respuestas[:2]
+
+    respuestas = asyncio.run(escenario())
+    assert [r.status_code for r in respuestas] == [200, 200]
+    assert llamadas == [1]
+    # La tarea terminada se quita de _inflight
+    assert main._inflight == {}
+
+
+def test_get_tras_escritura_no_se_une_a_la_lectura_anterior(monkeypatch):
+    monkeypatch.setattr(main, "_inflight", {})
+    llamadas = []
+    liberar = threading.Event()
+
+    def fetch_stub(residente_id):
+        llamadas.append(residente_id)
+        if len(llamadas) == 1:
+            # La primera lectura empezó antes de la escritura y tarda en terminar
+            liberar.wait(timeout=5)
+            return dict(FILA, nombre="Old")
+        return dict(FILA, nombre="New", version=1)
+
+    monkeypatch.setattr(main, "fetch_residente_by_id", fetch_stub)
+
+    async def escenario():
+        async with _async_client() as ac:
+            vieja = asyncio.ensure_future(ac.get("/residentes/1"))
+            while not llamadas:
+                await asyncio.sleep(0.01)
+
+            # La escritura ya cambió la versión en su hilo, pero el handler del PUT
+            # todavía no volvió al event loop
+            database._bump_data_version()
+            nueva = await ac.get("/residentes/1")
+
+            liberar.set()
+            return await vieja, nueva
+
+    vieja, nueva = asyncio.run(escenario())
+    assert llamadas == [1, 1]
+    assert nueva.json()["nombre"] == "New"
+    assert nueva.headers["etag"] == main._etag_actual()
+    # La lectura anterior conserva el ETag de su versión: el cliente la revalidará
+    assert vieja.json()["nombre"] == "Old"
+    assert vieja.headers["etag"] != nueva.headers["etag"]
+
+
+def test_release_inflight_no_quita_una_tarea_de_otra_version(monkeypatch):
+    async def escenario():
+        vieja = asyncio.ensure_future(asyncio.sleep(0))
+        nueva = asyncio.ensure_future(asyncio.sleep(0))
+        main._inflight[(1, 0)] = vieja
+        main._inflight[(1, 1)] = nueva
+        main._release_inflight((1, 0), vieja)
+        assert main._inflight == {(1, 1): nueva}
+        # Solo quita la tarea registrada bajo esa clave
+        main._release_inflight((1, 1), vieja)
+        assert main._inflight == {(1, 1): nueva}
+        main._release_inflight((1, 1), nueva)
+        assert main._inflight == {}
+        await asyncio.gather(vieja, nueva)
+
+    monkeypatch.setattr(main, "_inflight", {})
+    asyncio.run(escenario())
+
+
+def test_bulk_inserta_en_orden(client, monkeypatch):
+    recibidas = []
+    monkeypatch.setattr(main, "insert_residentes_bulk", lambda filas: recibidas.extend(filas) or len(filas))
+
+    segundo = dict(PAYLOAD, pasaporte="C1112223", email="otro@example.com")
+    respuesta = client.post("/residentes/bulk", json=[PAYLOAD, segundo])
+
+    assert respuesta.status_code == 201
+    assert respuesta.json()["insertados"] == 2
+    assert [fila[3] for fila in recibidas] == ["B7654321", "C1112223"]
+    assert recibidas[0][2] == date(1990, 1, 1)
+
+
+@pytest.mark.parametrize("cantidad", [0, main.MAX_BULK_SIZE + 1])
+def test_bulk_rechaza_lista_vacia_o_demasiado_grande(client, monkeypatch, cantidad):
+    def no_llamar(filas):
+        raise AssertionError("no debe llegar a la base de datos")
+
+    monkeypatch.setattr(main, "insert_residentes_bulk", no_llamar)
+
+    respuesta = client.post("/residentes/bulk", json=[PAYLOAD] * cantidad)
+    assert respuesta.status_code == 422
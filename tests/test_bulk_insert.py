@@ -0,0 +1,118 @@
+"""
+Tests de insert_residentes_bulk sin servidor MySQL.
+get_connection se reemplaza por una conexión falsa que registra las sentencias.
+"""
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from mysql.connector.errors import IntegrityError
+
+# Agregar el directorio raíz al path para importar app
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app import database
+
+
+COLUMNAS = 9
+
+
+def fila(n):
+    return (f"Nombre{n}", "Apellido", date(1990, 1, 1), f"P{n:07d}", f"r{n}@example.com",
+            None, None, None, None)
+
+
+class CursorFalso:
+    def __init__(self, conn):
+        self._conn = conn
+        self.rowcount = -1
+
+    def execute(self, sql, params):
+        if len(self._conn.sentencias) == self._conn.fallar_en:
+            raise IntegrityError(msg="Duplicate entry", errno=1062)
+        self._conn.sentencias.append((sql, params))
+        self.rowcount = len(params) // COLUMNAS
+
+    def close(self):
+        self._conn.cursor_cerrado = True
+
+
+class ConexionFalsa:
+    def __init__(self, fallar_en=None):
+        self.fallar_en = fallar_en
+        self.sentencias = []
+        self.eventos = []
+        self.cursor_cerrado = False
+
+    def cursor(self):
+        return CursorFalso(self)
+
+    def start_transaction(self):
+        self.eventos.append("start")
+
+    def commit(self):
+        self.eventos.append("commit")
+
+    def rollback(self):
+        self.eventos.append("rollback")
+
+    def close(self):
+        self.eventos.append("close")
+
+
+@pytest.fixture
+def conexion(monkeypatch):
+    def usar(fallar_en=None):
+        conn = ConexionFalsa(fallar_en)
+        monkeypatch.setattr(database, "get_connection", lambda: conn)
+        return conn
+    return usar
+
+
+@pytest.mark.parametrize(
+    "cantidad, bloques",
+    [
+        (1, [1]),
+        (database.BULK_CHUNK_SIZE, [database.BULK_CHUNK_SIZE]),
+        (database.BULK_CHUNK_SIZE + 1, [database.BULK_CHUNK_SIZE, 1]),
+    ],
+)
+def test_bloques_y_parametros(conexion, cantidad, bloques):
+    conn = conexion()
+    filas = [fila(n) for n in range(cantidad)]
+
+    assert database.insert_residentes_bulk(filas) == cantidad
+
+    assert [sql.count(database.INSERT_ROW_SQL) for sql, _ in conn.sentencias] == bloques
+    for sql, _ in conn.sentencias:
+        assert sql.startswith(database.INSERT_PREFIX_SQL)
+    # Los parámetros se aplanan en el mismo orden que las filas
+    parametros = [valor for _, params in conn.sentencias for valor in params]
+    assert parametros == [valor for f in filas for valor in f]
+
+    assert conn.eventos == ["start", "commit", "close"]
+    assert conn.cursor_cerrado
+
+
+def test_lista_vacia_no_abre_conexion(monkeypatch):
+    def no_llamar():
+        raise AssertionError("no debe pedir una conexión")
+
+    monkeypatch.setattr(database, "get_connection", no_llamar)
+    assert database.insert_residentes_bulk([]) == 0
+
+
+def test_error_de_integridad_revierte_todo(conexion):
+    # El segundo bloque choca con un pasaporte o email ya existente
+    conn = conexion(fallar_en=1)
+    version = database.get_data_version()
+    filas = [fila(n) for n in range(database.BULK_CHUNK_SIZE + 1)]
+
+    with pytest.raises(IntegrityError):
+        database.insert_residentes_bulk(filas)
+
+    assert conn.eventos == ["start", "rollback", "close"]
+    assert conn.cursor_cerrado
+    assert database.get_data_version() == version
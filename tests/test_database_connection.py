@@ -48,71 +48,63 @@ def test_connection():
         db_info = conn.get_server_info()
         print(f"   - Versión del servidor MySQL: {db_info}")
         
-        # Verificar la base de datos actual
-        cursor = conn.cursor()
-        cursor.execute("SELECT DATABASE();")
-        db_name = cursor.fetchone()
-        print(f"   - Base de datos conectada: {db_name[0]}")
-        cursor.close()
+        # Un solo cursor (buffered: cada resultado se lee completo) para todas las consultas
+        with conn.cursor(buffered=True) as cur:
+            # Verificar la base de datos actual
+            cur.execute("SELECT DATABASE();")
+            db_name = cur.fetchone()
+            print(f"   - Base de datos conectada: {db_name[0]}")
         
-        # Probar una consulta simple
-        print("\n[3] Probando consulta simple...")
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 as test;")
-        result = cursor.fetchone()
-        cursor.close()
+            # Probar una consulta simple
+            print("\n[3] Probando consulta simple...")
+            cur.execute("SELECT 1 as test;")
+            result = cur.fetchone()
         
-        if result and result[0] == 1:
-            print("✅ Consulta de prueba ejecutada correctamente")
-        else:
-            print("❌ ERROR: La consulta de prueba falló")
-            return False
+            if result and result[0] == 1:
+                print("✅ Consulta de prueba ejecutada correctamente")
+            else:
+                print("❌ ERROR: La consulta de prueba falló")
+                return False
         
-        # Verificar que la tabla residentes existe
-        print("\n[4] Verificando tabla 'residentes'...")
-        cursor = conn.cursor()
-        cursor.execute("SHOW TABLES LIKE 'residentes';")
-        table_exists = cursor.fetchone()
-        cursor.close()
+            # Verificar que la tabla residentes existe
+            print("\n[4] Verificando tabla 'residentes'...")
+            cur.execute("SHOW TABLES LIKE 'residentes';")
+            table_exists = cur.fetchone()
         
-        if table_exists:
-            print("✅ La tabla 'residentes' existe en la base de datos")
+            if table_exists:
+                print("✅ La tabla 'residentes' existe en la base de datos")
             
-            # Verificar la estructura de la tabla
-            print("\n[5] Verificando estructura de la tabla 'residentes'...")
-            cursor = conn.cursor()
-            cursor.execute("DESCRIBE residentes;")
-            columns = cursor.fetchall()
-            cursor.close()
+                # Verificar la estructura de la tabla
+                print("\n[5] Verificando estructura de la tabla 'residentes'...")
+                cur.execute("DESCRIBE residentes;")
+                columns = cur.fetchall()
             
-            expected_columns = ['id', 'nombre', 'apellido', 'fecha_nacimiento', 
-                              'pasaporte', 'email', 'telefono', 'direccion', 
-                              'ocupacion', 'estado_civil']
-            actual_columns = [col[0] for col in columns]
+                expected_columns = ['id', 'nombre', 'apellido', 'fecha_nacimiento', 
+                                  'pasaporte', 'email', 'telefono', 'direccion', 
+                                  'ocupacion', 'estado_civil']
+                actual_columns = [col[0] for col in columns]
             
-            if all(col in actual_columns for col in expected_columns):
-                print("✅ La estructura de la tabla es correcta")
-                print(f"   Columnas: {', '.join(actual_columns)}")
-            else:
-                print("⚠️  ADVERTENCIA: La estructura de la tabla no coincide")
-                print(f"   Esperado: {', '.join(expected_columns)}")
-                print(f"   Actual: {', '.join(actual_columns)}")
+                if all(col in actual_columns for col in expected_columns):
+                    print("✅ La estructura de la tabla es correcta")
+                    print(f"   Columnas: {', '.join(actual_columns)}")
+                else:
+                    print("⚠️  ADVERTENCIA: La estructura de la tabla no coincide")
+                    print(f"   Esperado: {', '.join(expected_columns)}")
+                    print(f"   Actual: {', '.join(actual_columns)}")
             
-            # Contar registros
-            print("\n[6] Verificando datos en la tabla...")
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM residentes;")
-            count = cursor.fetchone()
-            cursor.close()
+                # Contar registros
+                print("\n[6] Verificando datos en la tabla...")
+                cur.execute("SELECT COUNT(*) FROM residentes;")
+                count = cur.fetchone()
             
-            if count and count[0] > 0:
-                print(f"✅ La tabla contiene {count[0]} registro(s)")
+                if count and count[0] > 0:
+                    print(f"✅ La tabla contiene {count[0]} registro(s)")
+                else:
+                    print("⚠️  ADVERTENCIA: La tabla está vacía")
+                    print("   Considera insertar datos de ejemplo")
             else:
-                print("⚠️  ADVERTENCIA: La tabla está vacía")
-                print("   Considera insertar datos de ejemplo")
-        else:
-            print("⚠️  ADVERTENCIA: La tabla 'residentes' no existe")
-            print("   Ejecuta el script docs/init_db.sql para inicializar la base de datos")
+                print("⚠️  ADVERTENCIA: La tabla 'residentes' no existe")
+                print("   Ejecuta el script docs/init_db.sql para inicializar la base de datos")
         
         print("\n" + "=" * 60)
         print("✅ RESULTADO: Todas las pruebas pasaron correctamente")
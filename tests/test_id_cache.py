@@ -0,0 +1,81 @@
+"""
+Tests de la caché por id de app.database sin servidor MySQL.
+db_session y _execute_prepared se reemplazan por stubs.
+"""
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importar app
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app import database
+
+
+FILA = (1, "Juan", "Pérez", date(1985, 3, 15), "A1234567", "juan@example.com",
+        None, None, None, "Soltero", 0)
+
+
+class CursorStub:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def fetchall(self):
+        return self._filas
+
+
+@pytest.fixture
+def consultas(monkeypatch):
+    """Cuenta las consultas; `al_consultar` simula algo que ocurre durante la lectura."""
+    estado = {"n": 0, "al_consultar": None}
+
+    @contextmanager
+    def session_stub(transaction=False):
+        yield None
+
+    def execute_stub(conn, sql, params, dictionary=False):
+        estado["n"] += 1
+        if estado["al_consultar"]:
+            estado["al_consultar"]()
+        return CursorStub([FILA])
+
+    monkeypatch.setattr(database, "_id_cache", OrderedDict())
+    monkeypatch.setattr(database, "db_session", session_stub)
+    monkeypatch.setattr(database, "_execute_prepared", execute_stub)
+    return estado
+
+
+def test_lectura_se_guarda_en_cache(consultas):
+    primera = database.fetch_residente_by_id(1)
+    segunda = database.fetch_residente_by_id(1)
+
+    assert primera == segunda
+    assert primera["nombre"] == "Juan"
+    assert consultas["n"] == 1
+    # Cada llamada recibe su propia copia
+    assert primera is not segunda
+
+
+def test_escritura_durante_la_lectura_no_se_cachea(consultas):
+    # Otra escritura termina mientras la lectura está en curso
+    consultas["al_consultar"] = database._bump_data_version
+
+    assert database.fetch_residente_by_id(1) is not None
+    assert 1 not in database._id_cache
+
+    database.fetch_residente_by_id(1)
+    assert consultas["n"] == 2
+
+
+def test_entrada_vencida_vuelve_a_consultar(consultas, monkeypatch):
+    # Con TTL negativo cada entrada nace vencida
+    monkeypatch.setattr(database, "ID_CACHE_TTL", -1.0)
+
+    database.fetch_residente_by_id(1)
+    database.fetch_residente_by_id(1)
+    assert consultas["n"] == 2
@@ -0,0 +1,71 @@
+"""
+Tests de la caché de cursores preparados de _execute_prepared sin servidor MySQL.
+"""
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importar app
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app import database
+
+
+class CursorFalso:
+    def __init__(self, prepared, dictionary):
+        self.prepared = prepared
+        self.dictionary = dictionary
+        self.ejecutadas = []
+
+    def execute(self, sql, params):
+        self.ejecutadas.append((sql, params))
+
+
+class ConexionFalsa:
+    def __init__(self, connection_id):
+        self.connection_id = connection_id
+        self.creados = []
+
+    def cursor(self, prepared=False, dictionary=False):
+        cur = CursorFalso(prepared, dictionary)
+        self.creados.append(cur)
+        return cur
+
+
+class ConexionDelPool:
+    """Como PooledMySQLConnection: envuelve la conexión física en _cnx."""
+
+    def __init__(self, cnx):
+        self._cnx = cnx
+
+
+def test_reutiliza_el_cursor_por_sentencia_y_tipo():
+    cnx = ConexionFalsa(connection_id=10)
+
+    primero = database._execute_prepared(ConexionDelPool(cnx), database.SELECT_BY_ID_SQL, (1,))
+    # Otro préstamo del pool sobre la misma conexión física
+    segundo = database._execute_prepared(ConexionDelPool(cnx), database.SELECT_BY_ID_SQL, (2,))
+    assert primero is segundo
+    assert primero.prepared
+    assert primero.ejecutadas == [(database.SELECT_BY_ID_SQL, (1,)), (database.SELECT_BY_ID_SQL, (2,))]
+
+    # Misma sentencia con otro tipo de cursor, u otra sentencia: cursores distintos
+    dicts = database._execute_prepared(cnx, database.SELECT_BY_ID_SQL, (1,), dictionary=True)
+    otro = database._execute_prepared(cnx, database.DELETE_SQL, (1,))
+    assert dicts.dictionary
+    assert len({id(primero), id(dicts), id(otro)}) == 3
+    assert len(cnx.creados) == 3
+
+
+def test_reconexion_reconstruye_los_cursores():
+    cnx = ConexionFalsa(connection_id=10)
+    antes = database._execute_prepared(cnx, database.SELECT_BY_ID_SQL, (1,))
+
+    # El pool reconectó: los statements preparados en el servidor ya no existen
+    cnx.connection_id = 11
+    despues = database._execute_prepared(cnx, database.SELECT_BY_ID_SQL, (1,))
+
+    assert despues is not antes
+    assert len(cnx.creados) == 2
+    assert cnx._prep_cache == {(database.SELECT_BY_ID_SQL, False): despues}
+    assert database._execute_prepared(cnx, database.SELECT_BY_ID_SQL, (2,)) is despues
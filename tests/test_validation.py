@@ -0,0 +1,101 @@
+"""
+Tests de los validadores de app.validation (funciones puras, sin base de datos).
+"""
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importar app
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app import validation
+
+
+def test_fecha_nacimiento():
+    assert validation.validar_fecha_nacimiento(date(1985, 3, 15)) == date(1985, 3, 15)
+    with pytest.raises(ValueError):
+        validation.validar_fecha_nacimiento(date.today() + timedelta(days=1))
+    with pytest.raises(ValueError):
+        validation.validar_fecha_nacimiento(date(1800, 1, 1))
+
+
+def test_direccion():
+    assert validation.validar_direccion("  Av. Amazonas N34-12 ") == "Av. Amazonas N34-12"
+    with pytest.raises(ValueError):
+        validation.validar_direccion("a" * 256)
+
+
+def test_opcionales_vacios_son_none():
+    for validador in (
+        validation.validar_telefono,
+        validation.validar_direccion,
+        validation.validar_ocupacion,
+        validation.validar_estado_civil,
+    ):
+        assert validador(None) is None
+        assert validador("   ") is None
+
+
+def test_pasaporte():
+    assert validation.validar_pasaporte(" ab-12345 ") == "AB-12345"
+    for valor in ("", "A123", "AB 12345", "A" * 51):
+        with pytest.raises(ValueError):
+            validation.validar_pasaporte(valor)
+
+
+@pytest.mark.parametrize("valor", ["0991234567", "+593991234567"])
+def test_telefono_valido(valor):
+    assert validation.validar_telefono(f" {valor} ") == valor
+
+
+@pytest.mark.parametrize("valor", ["123", "09912345ab", "+" + "1" * 16])
+def test_telefono_invalido(valor):
+    with pytest.raises(ValueError):
+        validation.validar_telefono(valor)
+
+
+def test_nombre_se_normaliza():
+    assert validation.validar_nombre_apellido("  josé  maría ") == "José  María"
+
+
+@pytest.mark.parametrize("valor", ["", " ", "J", "Juan1", "Juan_Carlos", "a" * 101])
+def test_nombre_invalido(valor):
+    with pytest.raises(ValueError):
+        validation.validar_nombre_apellido(valor)
+
+
+def test_ocupacion():
+    assert validation.validar_ocupacion("ing. civil-estructural") == "Ing. Civil-Estructural"
+    with pytest.raises(ValueError):
+        validation.validar_ocupacion("Ingeniero/a")
+
+
+def test_estado_civil():
+    assert validation.validar_estado_civil(" unión libre ") == "Unión Libre"
+    with pytest.raises(ValueError, match="Opciones válidas: Soltero, Soltera"):
+        validation.validar_estado_civil("Comprometido")
+
+
+def test_email():
+    assert validation.validar_email(" ana@example.com ") == "ana@example.com"
+    for valor in ("", "ana.example.com", "ana@example", "a na@example.com", "a@b." + "c" * 150):
+        with pytest.raises(ValueError):
+            validation.validar_email(valor)
+
+
+@pytest.mark.parametrize(
+    "valor",
+    ["+593 (2) 123-4567", "099 123 4567", "099\t123 4567", "099　123 4567"],
+)
+def test_telefono_acepta_separadores(valor):
+    # Los separadores incluyen todo el espacio Unicode que cubría \s
+    assert validation.validar_telefono(valor) == valor
+
+
+def test_espacios_cubren_todo_unicode():
+    # Mismo conjunto que \s en un patrón str: todos los caracteres con isspace()
+    todos = frozenset(c for c in map(chr, range(sys.maxunicode + 1)) if c.isspace())
+    assert validation._ESPACIOS == todos